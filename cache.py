@@ -0,0 +1,69 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable, Iterable, Optional
+
+
+class LRUCache:
+    """Bounded, thread-safe LRU mapping: the least recently used entry is evicted first.
+
+    Runners read/write it from their inference worker while the GUI may clear it from
+    the Tk thread, so every operation holds the lock.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        if maxsize < 1:
+            raise ValueError("maxsize must be >= 1")
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._data
+
+
+def file_content_key(path: str) -> str:
+    """Content hash of an image file for result caching: BLAKE2 over the first 1 MiB plus the
+    file size. Cheap to compute, and keyed by content so renamed/duplicate files share entries."""
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        h.update(f.read(1 << 20))
+    h.update(str(os.path.getsize(path)).encode())
+    return h.hexdigest()
+
+
+def text_batch_key(texts: Iterable[str]) -> str:
+    """Content hash of a batch of texts for result caching. Each text is length-prefixed, so
+    batch boundaries are part of the key (["a\\x1fb"] != ["a", "b"], [] != [""])."""
+    h = hashlib.blake2b(digest_size=16)
+    for text in texts:
+        data = text.encode("utf-8")
+        h.update(len(data).to_bytes(8, "little"))
+        h.update(data)
+    return h.hexdigest()
@@ -5,18 +5,19 @@ def timeit(fn):
     """Decorator: measure runtime of a function and attach `last_runtime_s` attribute to the instance."""
     @functools.wraps(fn)
     def wrapper(self, *args, **kwargs):
-        start = time.time()
+        start = time.perf_counter()
         try:
             return fn(self, *args, **kwargs)
         finally:
-            self.last_runtime_s = time.time() - start
+            self.last_runtime_s = time.perf_counter() - start
     return wrapper
 
 def ensure_initialized(fn):
-    """Decorator: ensure the model has been initialized before using it."""
+    """Decorator: ensure the model has been initialized before using it.
+    Expects `_initialized` to always exist on the instance (set in the runner's __init__)."""
     @functools.wraps(fn)
     def wrapper(self, *args, **kwargs):
-        if not getattr(self, "_initialized", False):
+        if not self._initialized:
             raise RuntimeError("Model is not initialized. Call `load()` first.")
         return fn(self, *args, **kwargs)
     return wrapper
@@ -1,10 +1,14 @@
 import json
 import threading
 import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
 from tkinter import ttk, filedialog, messagebox
 
+from . import runtime_env  # noqa: F401  (sets OMP/MKL thread env vars before numpy/cv2/torch load)
 from PIL import Image, ImageTk  # for image preview
 
+from .cache import file_content_key
+from .imaging import decode_image
 from .models import (
     make_text_sentiment_runner,
     make_image_classifier_runner,
@@ -19,6 +23,8 @@ class AppGUI(ttk.Frame):
       • Selected image is previewed in the left pane when in Image mode.
     """
 
+    PREVIEW_SIZE = (520, 300)  # max preview thumbnail (width, height)
+
     def __init__(self, master: tk.Tk):
         super().__init__(master)
         self.master.title("Tkinter AI GUI")
@@ -40,11 +46,29 @@ class AppGUI(ttk.Frame):
         # Runners (Model 1 = Text, Model 2 = Image)
         self.text_runner = make_text_sentiment_runner()
         self.image_runner = make_image_classifier_runner()
+        # Selected images are decoded once for both the preview and Model 2, so the decode
+        # must cover the preview too (the runner raises it to the model input size on load)
+        self.image_runner.decode_size = (
+            max(self.PREVIEW_SIZE[0], self.image_runner.decode_size[0]),
+            max(self.PREVIEW_SIZE[1], self.image_runner.decode_size[1]),
+        )
+        # One worker per runner: inferences on the same model are serialized
+        self._text_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="text-infer")
+        self._image_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="image-infer")
+        self._closing = False
+        self.master.protocol("WM_DELETE_WINDOW", self._on_close)
 
         # State
         self.input_mode = tk.StringVar(value="text")   # "text" or "image"
         self._selected_image_path = tk.StringVar(value="")
         self._preview_photo = None  # keep ref to avoid GC
+        self._selected_pil = None   # decode of the selected image, handed to the next Model 2 run
+        self._selected_key = None   # content hash of the selected file (image result cache key)
+        self._load_lock = threading.Lock()  # serializes load() between pre-warm and menu/button loads
+        self._prewarm_done = False
+        self._load_errors = {}  # which -> error message, for pre-warm and manual loads
+        self._text_dirty = True          # set by <<Modified>>; cleared when a run reads the text
+        self._last_text_result = None    # result of the last text run, reused while text is unchanged
 
         # Menus
         self._build_menubar()
@@ -65,12 +89,17 @@ class AppGUI(ttk.Frame):
         self._update_selected_model_info()
         self._update_input_view()
 
+        # Load both models in the background; Run buttons enable as each becomes ready
+        self._refresh_run_buttons()
+        threading.Thread(target=self._prewarm, daemon=True).start()
+        self.master.after(200, self._poll_ready)
+
     # ------------- Menubar -------------
     def _build_menubar(self):
         menubar = tk.Menu(self.master)
 
         file_menu = tk.Menu(menubar, tearoff=0)
-        file_menu.add_command(label="Exit", command=self.master.quit)
+        file_menu.add_command(label="Exit", command=self._on_close)
         menubar.add_cascade(label="File", menu=file_menu)
 
         models_menu = tk.Menu(menubar, tearoff=0)
@@ -90,6 +119,13 @@ class AppGUI(ttk.Frame):
 
         self.master.config(menu=menubar)
 
+    def _on_close(self):
+        # Pool workers are non-daemon: drop queued inferences so exit only waits for a running one
+        self._closing = True
+        self._text_pool.shutdown(wait=False, cancel_futures=True)
+        self._image_pool.shutdown(wait=False, cancel_futures=True)
+        self.master.destroy()
+
     # ------------- Top row -------------
     def _build_model_selection_row(self):
         row = ttk.Frame(self)
@@ -112,6 +148,9 @@ class AppGUI(ttk.Frame):
         ttk.Label(row, text="  ").pack(side=tk.LEFT)  # spacer
         ttk.Button(row, text="Load Model", command=self._load_selected_model).pack(side=tk.LEFT, padx=(8, 0))
 
+        self.status_label = ttk.Label(row, text="Loading models in background…")
+        self.status_label.pack(side=tk.RIGHT)
+
     # ------------- I/O columns -------------
     def _build_io_columns(self):
         mid = ttk.Frame(self)
@@ -143,6 +182,7 @@ class AppGUI(ttk.Frame):
         self.text_container = ttk.Frame(self.input_stack)
         self.input_text = tk.Text(self.text_container, height=10, wrap="word")
         self.input_text.pack(fill=tk.BOTH, expand=True)
+        self.input_text.bind("<<Modified>>", self._on_text_modified)
 
         # Image preview container
         self.image_container = ttk.Frame(self.input_stack)
@@ -152,8 +192,10 @@ class AppGUI(ttk.Frame):
         # Buttons row
         btns = ttk.Frame(left)
         btns.pack(fill=tk.X, pady=(0, 6))
-        ttk.Button(btns, text="Run Model 1", command=self._run_model1_threaded).pack(side=tk.LEFT)
-        ttk.Button(btns, text="Run Model 2", command=self._run_model2_threaded).pack(side=tk.LEFT, padx=6)
+        self.run1_btn = ttk.Button(btns, text="Run Model 1", command=self._run_model1_threaded)
+        self.run1_btn.pack(side=tk.LEFT)
+        self.run2_btn = ttk.Button(btns, text="Run Model 2", command=self._run_model2_threaded)
+        self.run2_btn.pack(side=tk.LEFT, padx=6)
         ttk.Button(btns, text="Cl", width=4, command=self._clear_io).pack(side=tk.LEFT)
 
         # Right: Output section
@@ -228,8 +270,19 @@ class AppGUI(ttk.Frame):
         self._selected_image_path.set("")
         self.preview_label.configure(text="No image selected", image="")
         self._preview_photo = None
+        self._selected_pil = None
+        self._selected_key = None
+        self._last_text_result = None
+        self.text_runner.clear_cache()
+        self.image_runner.clear_cache()
         self._set_output("")
 
+    def _on_text_modified(self, _event=None):
+        # Resetting the flag re-fires <<Modified>>, so only react when it is actually set
+        if self.input_text.edit_modified():
+            self._text_dirty = True
+            self.input_text.edit_modified(False)
+
     def _set_output(self, text: str):
         self.output_text.configure(state="normal")
         self.output_text.delete("1.0", tk.END)
@@ -247,14 +300,43 @@ class AppGUI(ttk.Frame):
         if not path:
             return
         self._selected_image_path.set(path)
-        try:
-            img = Image.open(path).convert("RGB")
-            # Fit nicely in the container
-            img.thumbnail((520, 300))
-            self._preview_photo = ImageTk.PhotoImage(img)
-            self.preview_label.configure(image=self._preview_photo, text="")
-        except Exception as e:
-            messagebox.showerror("Error", str(e))
+        self.preview_label.configure(text="Loading preview…", image="")
+        self._preview_photo = None
+        self._selected_pil = None
+        self._selected_key = None
+        self._load_preview_async(path)
+
+    # ------------- Image preview (worker thread) -------------
+    def _load_preview_async(self, path: str):
+        """Decode the image once off the Tk thread; the preview and Model 2 both use that decode."""
+        def work():
+            try:
+                cache_key = file_content_key(path)
+                thumb, full = self._decode_image(path)
+            except Exception as e:
+                self._post(lambda err=str(e): messagebox.showerror("Error", err))
+                return
+            self._post(lambda: self._show_preview(path, thumb, full, cache_key))
+
+        threading.Thread(target=work, daemon=True).start()
+
+    def _show_preview(self, path: str, thumb: Image.Image, full: Image.Image, cache_key: str):
+        # Ignore stale previews if another image was picked (or cleared) meanwhile
+        if path != self._selected_image_path.get():
+            return
+        self._preview_photo = ImageTk.PhotoImage(thumb)
+        self.preview_label.configure(image=self._preview_photo, text="")
+        self._selected_pil = full
+        self._selected_key = cache_key
+
+    def _decode_image(self, path: str):
+        """Decode `path` once, at reduced scale when it is large; return (preview thumbnail,
+        decoded RGB image). The decode covers both the preview and the model input size."""
+        image = decode_image(path, min_size=self.image_runner.decode_size)
+        # Fit nicely in the container, preserving aspect ratio and never upscaling
+        thumb = image.copy()
+        thumb.thumbnail(self.PREVIEW_SIZE, Image.Resampling.LANCZOS)
+        return thumb, image
 
     def _selected_runner(self):
         idx = self.model_select.current()
@@ -272,37 +354,101 @@ class AppGUI(ttk.Frame):
         self._load_runner("model1" if idx == 0 else "model2")
 
     def _load_runner(self, which: str):
-        try:
-            if which == "model1":
-                self.text_runner.load()
-            else:
-                self.image_runner.load()
+        runner = self.text_runner if which == "model1" else self.image_runner
+        name = "Model 1" if which == "model1" else "Model 2"
+        # Skip reloading if the background pre-warm already finished this model
+        if runner.initialized:
             messagebox.showinfo("Model", "Model loaded successfully.")
-        except Exception as e:
-            messagebox.showerror("Error", str(e))
+            return
+        # Never block the Tk thread on the lock: a load (possibly a large download) is running
+        if not self._load_lock.acquire(blocking=False):
+            messagebox.showinfo("Model", "Models are still loading in the background; Run will enable when ready.")
+            return
+        self.status_label.configure(text=f"Loading {name}…")
+
+        def work():
+            error = None
+            try:
+                runner.load()
+            except Exception as e:
+                error = str(e)
+            finally:
+                self._load_lock.release()
+            self._post(lambda: self._on_load_finished(which, error))
+
+        threading.Thread(target=work, daemon=True).start()
+
+    def _on_load_finished(self, which: str, error):
+        """Runs on the Tk thread after a manual load."""
+        if error is None:
+            self._load_errors.pop(which, None)
+        else:
+            self._load_errors[which] = error
+        self._refresh_run_buttons()
+        self._update_status()
+        if error is None:
+            messagebox.showinfo("Model", "Model loaded successfully.")
+        else:
+            messagebox.showerror("Error", error)
+
+    # ------------- Background pre-warm -------------
+    def _prewarm(self):
+        """Runs on a worker thread: load both models so the first Run click only pays inference time."""
+        for which, runner in (("model1", self.text_runner), ("model2", self.image_runner)):
+            try:
+                with self._load_lock:
+                    if not runner.initialized:
+                        runner.load()
+            except Exception as e:
+                self._load_errors[which] = str(e)
+        self._prewarm_done = True
+
+    def _poll_ready(self):
+        """Runs on the Tk thread: reflect pre-warm progress in the buttons and status label."""
+        self._refresh_run_buttons()
+        if not self._prewarm_done:
+            self.master.after(200, self._poll_ready)
+            return
+        self._update_status()
+
+    def _update_status(self):
+        if self._load_errors:
+            failed = ", ".join(
+                f"{'Model 1' if which == 'model1' else 'Model 2'} ({err})"
+                for which, err in self._load_errors.items()
+            )
+            self.status_label.configure(text=f"Failed to load: {failed}")
+        elif not self._prewarm_done:
+            self.status_label.configure(text="Loading models in background…")
+        else:
+            self.status_label.configure(text="Models ready.")
+
+    def _refresh_run_buttons(self):
+        self.run1_btn.configure(state="normal" if self.text_runner.initialized else "disabled")
+        self.run2_btn.configure(state="normal" if self.image_runner.initialized else "disabled")
 
     # ------------- Run (threaded) -------------
+    # Input is validated on the Tk thread; inference runs on the runner's single-worker
+    # pool (so clicks queue instead of racing) and the result is shown via `after`.
     def _run_model1_threaded(self):
-        threading.Thread(target=self._run_model1, daemon=True).start()
-
-    def _run_model2_threaded(self):
-        threading.Thread(target=self._run_model2, daemon=True).start()
-
-    def _run_model1(self):
         if self.input_mode.get() != "text":
             messagebox.showwarning("Input", "Switch input mode to Text to run Model 1.")
             return
+        # Unchanged text since the last run: skip reading the widget and re-running
+        if not self._text_dirty and self._last_text_result is not None:
+            self._set_output(self._format_text_result_top1({**self._last_text_result, "runtime_s": 0.0}))
+            return
+        self._text_dirty = False
+        self._last_text_result = None
         txt = self.input_text.get("1.0", tk.END).strip()
         if not txt:
             messagebox.showwarning("Input", "Please enter some text.")
             return
-        try:
-            result = self.text_runner.run(txt)
-            self._set_output(self._format_text_result_top1(result))
-        except Exception as e:
-            messagebox.showerror("Error", str(e))
+        # Each non-empty line is classified separately, in a single batched call
+        inputs = [line for line in txt.splitlines() if line.strip()] or [txt]
+        self._submit(self._text_pool, self._run_model1, inputs)
 
-    def _run_model2(self):
+    def _run_model2_threaded(self):
         if self.input_mode.get() != "image":
             messagebox.showwarning("Input", "Switch input mode to Image to run Model 2.")
             return
@@ -310,23 +456,61 @@ class AppGUI(ttk.Frame):
         if not path:
             messagebox.showwarning("Input", "Please browse and select an image.")
             return
+        # Hand over the preview's decode (then drop our reference so the decoded buffer is
+        # not kept alive); later runs hit the result cache via the same content key.
+        image = self._selected_pil if self._selected_pil is not None else path
+        self._selected_pil = None
+        self._submit(self._image_pool, self._run_model2, image, self._selected_key)
+
+    def _submit(self, pool, fn, *args):
+        pool.submit(fn, *args).add_done_callback(lambda f: self._post(self._show_result, f))
+
+    def _post(self, fn, *args):
+        """Schedule `fn(*args)` on the Tk thread from a worker; dropped once the window is closing."""
+        if self._closing:
+            return
         try:
-            # Top-1: we ask for a single best label
-            result = self.image_runner.run(path, top_k=1)
-            self._set_output(self._format_image_result_top1(result))
+            self.master.after(0, fn, *args)
+        except (RuntimeError, tk.TclError):
+            pass  # root destroyed between the check and the call
+
+    def _show_result(self, future):
+        """Runs on the Tk thread; `future.result()` re-raises any inference error here."""
+        try:
+            self._set_output(future.result())
         except Exception as e:
             messagebox.showerror("Error", str(e))
 
+    def _run_model1(self, inputs):
+        result = self.text_runner.run(inputs)
+        self._last_text_result = result
+        return self._format_text_result_top1(result)
+
+    def _run_model2(self, image, cache_key):
+        # `image` is the pre-decoded PIL image when available, else the file path;
+        # `cache_key` is None until the preview worker has hashed the file.
+        # Top-1: we ask for a single best label
+        result = self.image_runner.run(image, top_k=1, cache_key=cache_key)
+        return self._format_image_result_top1(result)
+
     # ------------- Formatting (Top-1 only) -------------
     def _format_text_result_top1(self, result_dict):
         try:
             results = result_dict.get("results", [])
             if isinstance(results, list) and results:
-                r = results[0]
-                label = r.get("label", "?")
-                score = r.get("score", 0.0)
                 rt = result_dict.get("runtime_s", 0.0)
-                return f"Label: {label}\nScore: {score:.4f}\nRuntime: {rt:.3f}s"
+                if len(results) == 1:
+                    r = results[0]
+                    label = r.get("label", "?")
+                    score = r.get("score", 0.0)
+                    return f"Label: {label}\nScore: {score:.4f}\nRuntime: {rt:.3f}s"
+                # One entry per input line
+                lines = [
+                    f"{i}. Label: {r.get('label', '?')}  Score: {r.get('score', 0.0):.4f}"
+                    for i, r in enumerate(results, start=1)
+                ]
+                lines.append(f"Runtime: {rt:.3f}s")
+                return "\n".join(lines)
             return json.dumps(result_dict, indent=2)
         except Exception:
             return json.dumps(result_dict, indent=2)
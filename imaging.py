@@ -0,0 +1,66 @@
+from typing import Optional, Tuple
+
+from PIL import Image
+
+try:
+    import cv2  # faster JPEG decode than PIL
+    import numpy as np
+except ImportError:
+    cv2 = None
+
+# EXIF Orientation tag (0x0112) -> transpose that displays the image upright
+_EXIF_ORIENTATION = 0x0112
+_ORIENTATION_TRANSPOSE = {
+    2: Image.Transpose.FLIP_LEFT_RIGHT,
+    3: Image.Transpose.ROTATE_180,
+    4: Image.Transpose.FLIP_TOP_BOTTOM,
+    5: Image.Transpose.TRANSPOSE,
+    6: Image.Transpose.ROTATE_270,
+    7: Image.Transpose.TRANSVERSE,
+    8: Image.Transpose.ROTATE_90,
+}
+# Orientations 5-8 swap width and height
+_SWAPS_AXES = {5, 6, 7, 8}
+
+
+def _reduced_flag(stored_size: Tuple[int, int], target: Tuple[int, int]) -> int:
+    """Largest IMREAD_REDUCED_COLOR_{8,4,2} whose output still covers `target` (else full size)."""
+    w, h = stored_size
+    for factor, flag in ((8, cv2.IMREAD_REDUCED_COLOR_8), (4, cv2.IMREAD_REDUCED_COLOR_4),
+                         (2, cv2.IMREAD_REDUCED_COLOR_2)):
+        if w // factor >= target[0] and h // factor >= target[1]:
+            return flag
+    return cv2.IMREAD_COLOR
+
+
+def decode_image(path: str, min_size: Optional[Tuple[int, int]] = None) -> Image.Image:
+    """Decode `path` to an upright RGB image.
+
+    With `min_size` (width, height) the decoder may return a reduced-scale image that still
+    covers it: JPEG DCT scaling via `Image.draft` / IMREAD_REDUCED_COLOR_*, far cheaper than
+    decoding full resolution only to downscale it. Without it the full image is decoded.
+
+    Every caller (GUI preview, ImageModelRunner path input) goes through here so results
+    cached by file content always come from identical pixels: both backends decode the raw
+    pixels and the EXIF orientation is applied once, from the same table.
+    """
+    with Image.open(path) as src:
+        orientation = src.getexif().get(_EXIF_ORIENTATION, 1)
+        target = None
+        if min_size is not None:
+            # min_size is upright; the file stores pixels before the orientation transpose
+            target = min_size[::-1] if orientation in _SWAPS_AXES else tuple(min_size)
+        img = None
+        if cv2 is not None:
+            flag = _reduced_flag(src.size, target) if target is not None else cv2.IMREAD_COLOR
+            # np.fromfile + imdecode handles non-ASCII paths on Windows, unlike cv2.imread
+            arr = cv2.imdecode(np.fromfile(path, dtype=np.uint8), flag | cv2.IMREAD_IGNORE_ORIENTATION)
+            if arr is not None:
+                img = Image.fromarray(cv2.cvtColor(arr, cv2.COLOR_BGR2RGB))
+        if img is None:
+            # PIL fallback (no OpenCV, or formats imdecode can't read such as GIF)
+            if target is not None:
+                src.draft("RGB", target)  # no-op for non-JPEG formats
+            img = src.convert("RGB")
+    transpose = _ORIENTATION_TRANSPOSE.get(orientation)
+    return img.transpose(transpose) if transpose is not None else img
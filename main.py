@@ -1,7 +1,14 @@
+import logging
 import tkinter as tk
+from .runtime_env import log_level_from_env
 from .gui import AppGUI
 
 def main():
+    # Runner logs are INFO; set HF_GUI_LOG_LEVEL=INFO to see them
+    logging.basicConfig(
+        level=log_level_from_env(),
+        format="[%(levelname)s] %(name)s: %(message)s",
+    )
     root = tk.Tk()
     AppGUI(root)
     root.geometry("900x700")
@@ -1,42 +1,139 @@
+import logging
+import os
+import time
 from abc import ABC, abstractmethod
-from typing import Any, Dict
-from dataclasses import dataclass, field
+from typing import Any, Callable, ClassVar, Dict, List, Tuple, Union
 
-from transformers import pipeline
+# Imported first: set thread/cache env vars before torch/transformers are imported
+from .runtime_env import INTRA_OP_THREADS
+from .paths import ONNX_DIR
+
+import numpy as np
+import torch
+from transformers import (
+    AutoImageProcessor,
+    AutoModelForImageClassification,
+    AutoModelForSequenceClassification,
+    AutoTokenizer,
+    pipeline,
+)
 from PIL import Image
 
+from .cache import LRUCache, file_content_key, text_batch_key
 from .decorators import timeit, ensure_initialized
+from .imaging import decode_image
+
+logger = logging.getLogger(__name__)
+
+# Text models are dynamically quantized to int8 on CPU for faster inference.
+# Set HF_GUI_NO_QUANTIZE=1 to keep exact fp32 weights.
+NO_QUANTIZE_ENV = "HF_GUI_NO_QUANTIZE"
+
+torch.set_num_threads(INTRA_OP_THREADS)
+try:
+    # One inference at a time per runner, so inter-op parallelism only adds contention
+    torch.set_num_interop_threads(1)
+except RuntimeError:
+    pass  # already set, or parallel work already started in this process
 
 
 # ---------------------------
 # Mixins (Multiple Inheritance)
 # ---------------------------
 class LoggingMixin:
-    def log(self, message: str) -> None:
-        if getattr(self, "_logger_enabled", True):
-            print(f"[LOG] {self.__class__.__name__}: {message}")
+    __slots__ = ()
+
+    def log(self, message: str, *args: Any, level: int = logging.INFO) -> None:
+        # %-style args are only formatted if the record is actually emitted
+        if self._logger_enabled and logger.isEnabledFor(level):
+            logger.log(level, "%s: " + message, self.__class__.__name__, *args)
 
 
 # ---------------------------------
 # Abstract Base Runner (Encapsulation)
 # ---------------------------------
-@dataclass
 class BaseModelRunner(ABC, LoggingMixin):
-    model_id: str
-    task: str
-    category: str               # e.g., "Text", "Vision", "Audio"
-    short_description: str = "" # brief human description
+    # Slots instead of a per-instance __dict__ (subclasses declare their own extras)
+    __slots__ = (
+        "model_id",
+        "task",
+        "category",
+        "short_description",
+        "compile_model",
+        "_initialized",
+        "_pipe",
+        "last_runtime_s",
+        "_cache",
+        "_logger_enabled",
+    )
+
+    # Capacity of the per-runner LRU of previous results
+    cache_size: ClassVar[int] = 128
 
-    _initialized: bool = field(default=False, init=False, repr=False)
-    _pipe: Any = field(default=None, init=False, repr=False)
-    last_runtime_s: float = field(default=0.0, init=False)
+    def __init__(
+        self,
+        model_id: str,
+        task: str,
+        category: str,                  # e.g., "Text", "Vision", "Audio"
+        short_description: str = "",    # brief human description
+        compile_model: bool = False,    # wrap the model with torch.compile on load
+    ) -> None:
+        self.model_id = model_id
+        self.task = task
+        self.category = category
+        self.short_description = short_description
+        self.compile_model = compile_model
+
+        self._initialized = False
+        self._pipe: Any = None
+        self.last_runtime_s = 0.0
+        self._cache = LRUCache(self.cache_size)
+        self._logger_enabled = True  # per-runner switch checked by LoggingMixin.log
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}(model_id={self.model_id!r}, task={self.task!r}, "
+            f"category={self.category!r}, short_description={self.short_description!r}, "
+            f"compile_model={self.compile_model!r}, last_runtime_s={self.last_runtime_s!r})"
+        )
 
     @property
     def initialized(self) -> bool:
         return self._initialized
 
-    @abstractmethod
+    def clear_cache(self) -> None:
+        self._cache.clear()
+
+    def _compile_model(self, model: Any, warmup: Callable[[Any], Any]) -> Any:
+        """Optionally compile `model` and run one warm-up call so the first user
+        request does not pay the compilation cost. Falls back to the eager model."""
+        if not self.compile_model:
+            return model
+        try:
+            compiled = torch.compile(model, mode="reduce-overhead", fullgraph=False)
+            with torch.inference_mode():
+                warmup(compiled)
+            self.log("Model compiled with torch.compile")
+            return compiled
+        except Exception as e:
+            self.log("torch.compile failed, using eager model: %s", e, level=logging.WARNING)
+            return model
+
+    def _load_model(self, auto_cls: Any) -> Any:
+        """Load pretrained weights in eval mode. Downloads are cached under HF_HUB_CACHE
+        (see paths.py), so relaunches read the local checkpoint instead of the network."""
+        return auto_cls.from_pretrained(self.model_id).eval()
+
+    @timeit
     def load(self) -> None:
+        """Template method: shared logging/timing/state, model-specific setup in `_load_pipeline`."""
+        self.log("Loading %s model: task=%s, model=%s", self.category.lower(), self.task, self.model_id)
+        self._load_pipeline()
+        self._initialized = True
+
+    @abstractmethod
+    def _load_pipeline(self) -> None:
+        """Build whatever `run()` needs (pipeline, model, processor...)."""
         ...
 
     @abstractmethod
@@ -59,23 +156,103 @@ class BaseModelRunner(ABC, LoggingMixin):
 # Text Model Runner (Polymorphism + Overriding)
 # ---------------------------
 class TextModelRunner(BaseModelRunner):
-    @timeit
-    def load(self) -> None:
-        self.log(f"Loading text pipeline: task={self.task}, model={self.model_id}")
-        self._pipe = pipeline(task=self.task, model=self.model_id)
-        self._initialized = True
+    __slots__ = ("backend", "_tok_cache")
+
+    # Capacity of the LRU of per-string tokenizer encodings
+    tok_cache_size: ClassVar[int] = 256
+
+    def __init__(self, *args, backend: str = "torch", **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        if backend not in ("torch", "onnx"):
+            raise ValueError(f"Unknown backend {backend!r}; expected 'torch' or 'onnx'.")
+        self.backend = backend
+        self._tok_cache = LRUCache(self.tok_cache_size)
+
+    def clear_cache(self) -> None:
+        super().clear_cache()
+        self._tok_cache.clear()
+
+    def _encode(self, text: str) -> Dict[str, List[int]]:
+        """Tokenize one string (unpadded), reusing a cached encoding for repeated prompts."""
+        enc = self._tok_cache.get(text)
+        if enc is None:
+            enc = dict(self._pipe.tokenizer(text, truncation=True))
+            self._tok_cache.put(text, enc)
+        return enc
+
+    def _load_onnx_pipeline(self) -> Any:
+        """Build the pipeline on an ONNX Runtime model, exporting it to ONNX_DIR on first use."""
+        try:
+            from optimum.onnxruntime import ORTModelForSequenceClassification
+        except ImportError as e:
+            raise RuntimeError("backend='onnx' requires `pip install optimum[onnxruntime]`.") from e
+
+        export_dir = ONNX_DIR / self.model_id.replace("/", "--")
+        if (export_dir / "model.onnx").exists():
+            model = ORTModelForSequenceClassification.from_pretrained(export_dir, provider="CPUExecutionProvider")
+            tokenizer = AutoTokenizer.from_pretrained(export_dir, use_fast=True)
+        else:
+            self.log("Exporting %s to ONNX (one-time)", self.model_id)
+            model = ORTModelForSequenceClassification.from_pretrained(
+                self.model_id, export=True, provider="CPUExecutionProvider"
+            )
+            tokenizer = AutoTokenizer.from_pretrained(self.model_id, use_fast=True)
+            model.save_pretrained(export_dir)
+            tokenizer.save_pretrained(export_dir)
+        return pipeline(task=self.task, model=model, tokenizer=tokenizer)
+
+    def _load_pipeline(self) -> None:
+        if self.backend == "onnx":
+            # Graph fusions + MLAS kernels replace the torch quantize/compile steps below
+            self._pipe = self._load_onnx_pipeline()
+            return
+
+        model = self._load_model(AutoModelForSequenceClassification)
+        tokenizer = AutoTokenizer.from_pretrained(self.model_id, use_fast=True)
+        self._pipe = pipeline(task=self.task, model=model, tokenizer=tokenizer)
+        if self._pipe.device.type == "cpu" and os.environ.get(NO_QUANTIZE_ENV, "0") != "1":
+            self.log("Applying dynamic int8 quantization to Linear layers")
+            self._pipe.model = torch.ao.quantization.quantize_dynamic(
+                self._pipe.model, {torch.nn.Linear}, dtype=torch.qint8
+            )
+        self._pipe.model = self._compile_model(
+            self._pipe.model,
+            lambda m: m(**self._pipe.tokenizer("warmup", return_tensors="pt").to(self._pipe.device)),
+        )
 
     @ensure_initialized
     @timeit
-    def run(self, user_input: str, **kwargs) -> Dict[str, Any]:
-        self.log(f"Running text model on input length={len(user_input)}")
-        results = self._pipe(user_input)
-        return {
-            "results": results,
-            "runtime_s": self.last_runtime_s,
-            "model": self.model_id,
-            "task": self.task,
-        }
+    def run(self, user_input: Union[str, List[str]], **kwargs) -> Dict[str, Any]:
+        start_time = time.perf_counter()
+        # A single string or a list of strings; lists are run in batches of `batch_size`
+        texts = [user_input] if isinstance(user_input, str) else list(user_input)
+        key = text_batch_key(texts)
+        entry = self._cache.get(key)
+        if entry is not None:
+            self.log("Returning cached text result")
+            return {**entry, "runtime_s": time.perf_counter() - start_time}
+
+        batch_size = int(kwargs.get("batch_size", 8))
+        self.log("Running text model on %d input(s), batch_size=%d", len(texts), batch_size)
+        # The pipeline only holds the tokenizer/model here: tokenization goes through the
+        # encoding cache, and the forward pass + softmax/argmax (the pipeline's default
+        # postprocessing) are done directly. One result dict per input, in input order.
+        tokenizer, model = self._pipe.tokenizer, self._pipe.model
+        id2label = model.config.id2label
+        results = []
+        with torch.inference_mode():
+            for start in range(0, len(texts), batch_size):
+                encodings = [self._encode(t) for t in texts[start:start + batch_size]]
+                batch = tokenizer.pad(encodings, return_tensors="pt").to(self._pipe.device)
+                scores, ids = model(**batch).logits.softmax(-1).max(-1)
+                results.extend(
+                    {"label": id2label[i], "score": score}
+                    for score, i in zip(scores.tolist(), ids.tolist())
+                )
+        # Cache entries carry no timing; runtime_s is measured for this call only
+        entry = {"results": results, "model": self.model_id, "task": self.task}
+        self._cache.put(key, entry)
+        return {**entry, "runtime_s": time.perf_counter() - start_time}
 
     def describe(self) -> str:
         return (
@@ -88,37 +265,93 @@ class TextModelRunner(BaseModelRunner):
 # Image Model Runner (Polymorphism + Overriding)
 # ---------------------------
 class ImageModelRunner(BaseModelRunner):
-    def _preprocess(self, img: Image.Image) -> Image.Image:
-        # Overridable preprocessing step; identity for now
-        return img
+    # The vision model is driven directly (processor -> model) rather than via a
+    # pipeline, so preprocessed tensors stay on the inference device.
+    __slots__ = ("_processor", "_model", "_device", "decode_size")
 
-    @timeit
-    def load(self) -> None:
-        self.log(f"Loading image pipeline: task={self.task}, model={self.model_id}")
-        self._pipe = pipeline(task=self.task, model=self.model_id)
-        self._initialized = True
+    cache_size: ClassVar[int] = 64
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._processor: Any = None
+        self._model: Any = None
+        self._device = "cpu"
+        # Smallest (width, height) an image file is decoded at (see imaging.decode_image);
+        # raised to the processor's input size on load. Callers that reuse the decode for
+        # other purposes (e.g. a preview) may raise it further.
+        self.decode_size: Tuple[int, int] = (224, 224)
+
+    def _preprocess(self, pixel_values: torch.Tensor) -> torch.Tensor:
+        # Overridable preprocessing step on the processor's tensors; identity for now
+        return pixel_values
+
+    def _load_pipeline(self) -> None:
+        self._device = "cuda" if torch.cuda.is_available() else "cpu"
+        self._processor = AutoImageProcessor.from_pretrained(self.model_id)
+        size = getattr(self._processor, "size", None) or {}
+        if "width" in size and "height" in size:
+            input_size = (size["width"], size["height"])
+        else:
+            edge = size.get("shortest_edge", 0)
+            input_size = (edge, edge)
+        self.decode_size = (max(self.decode_size[0], input_size[0]), max(self.decode_size[1], input_size[1]))
+        model = self._load_model(AutoModelForImageClassification).to(self._device)
+        self._model = self._compile_model(
+            model,
+            lambda m: m(**self._processor(Image.new("RGB", (224, 224)), return_tensors="pt").to(self._device)),
+        )
 
     @ensure_initialized
     @timeit
     def run(self, user_input: Any, **kwargs) -> Dict[str, Any]:
+        start_time = time.perf_counter()
         # Accept a path or a PIL.Image
-        if isinstance(user_input, (str,)):
-            img = Image.open(user_input).convert("RGB")
-        elif isinstance(user_input, Image.Image):
-            img = user_input
-        else:
+        if not isinstance(user_input, (str, Image.Image)):
             raise TypeError("user_input must be a path or PIL.Image.Image for image tasks.")
-
-        img = self._preprocess(img)
         top_k = int(kwargs.get("top_k", 5))
-        self.log(f"Running image model (top_k={top_k}) on provided image...")
-        results = self._pipe(img, top_k=top_k)
-        return {
-            "results": results,
-            "runtime_s": self.last_runtime_s,
-            "model": self.model_id,
-            "task": self.task,
-        }
+
+        # Results are cached by file content: callers holding a decoded image pass the
+        # file's `cache_key` (see cache.file_content_key); paths are hashed here. Images
+        # without a key are not cached -- hashing the pixel buffer costs as much as a decode.
+        cache_key = kwargs.get("cache_key")
+        if cache_key is None and isinstance(user_input, str):
+            cache_key = file_content_key(user_input)
+        key = (cache_key, top_k) if cache_key is not None else None
+        entry = self._cache.get(key) if key is not None else None
+        if entry is not None:
+            self.log("Returning cached image result")
+            return {**entry, "runtime_s": time.perf_counter() - start_time}
+
+        if isinstance(user_input, str):
+            img = decode_image(user_input, min_size=self.decode_size)
+        else:
+            img = user_input
+
+        self.log("Running image model (top_k=%d) on provided image...", top_k)
+        inputs = self._processor(img, return_tensors="pt").to(self._device)
+        pixel_values = self._preprocess(inputs["pixel_values"])
+        with torch.inference_mode():
+            logits = self._model(pixel_values=pixel_values).logits
+        id2label = self._model.config.id2label
+        if top_k == 1:
+            # Top-1 fast path: argmax, then the winner's softmax probability only.
+            # With the max logit as the shift, p = 1 / sum(exp(logits - max)).
+            row = logits[0].float().cpu().numpy()
+            idx = int(row.argmax())
+            score = float(1.0 / np.exp(row - row[idx]).sum())
+            results = [{"label": id2label[idx], "score": score}]
+        else:
+            probs = logits.softmax(-1)[0]
+            scores, ids = probs.topk(min(top_k, probs.numel()))
+            results = [
+                {"label": id2label[i], "score": score}
+                for score, i in zip(scores.tolist(), ids.tolist())
+            ]
+        # Cache entries carry no timing; runtime_s is measured for this call only
+        entry = {"results": results, "model": self.model_id, "task": self.task}
+        if key is not None:
+            self._cache.put(key, entry)
+        return {**entry, "runtime_s": time.perf_counter() - start_time}
 
     def describe(self) -> str:
         return (
@@ -130,18 +363,21 @@ class ImageModelRunner(BaseModelRunner):
 # ---------------------------
 # Factory helpers (two models from different categories)
 # ---------------------------
-def make_text_sentiment_runner() -> TextModelRunner:
+def make_text_sentiment_runner(compile_model: bool = False, backend: str = "torch") -> TextModelRunner:
     return TextModelRunner(
         model_id="distilbert-base-uncased-finetuned-sst-2-english",
         task="sentiment-analysis",
         category="Text",
         short_description="Binary sentiment (POSITIVE/NEGATIVE) for short English text.",
+        compile_model=compile_model,
+        backend=backend,
     )
 
-def make_image_classifier_runner() -> ImageModelRunner:
+def make_image_classifier_runner(compile_model: bool = False) -> ImageModelRunner:
     return ImageModelRunner(
         model_id="google/vit-base-patch16-224",
         task="image-classification",
         category="Vision",
         short_description="ImageNet-style image classification using ViT base.",
+        compile_model=compile_model,
     )
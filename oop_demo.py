@@ -13,7 +13,8 @@ def get_explanations() -> str:
         "   - Both runners implement a common `run(input)` interface returning a dict.\n\n"
         "5) Method Overriding:\n"
         "   - `describe()` is defined in the base and overridden in both runners.\n"
-        "   - `_preprocess()` in Image runner can be overridden by subclasses.\n\n"
+        "   - `_preprocess()` in Image runner can be overridden by subclasses.\n"
+        "   - `load()` is a template method in the base; each runner overrides the `_load_pipeline()` hook.\n\n"
         "6) Multi-file Structure:\n"
         "   - Code split across `models.py`, `gui.py`, `utils/`, and `main.py` as requested.\n\n"
         "7) Hugging Face Integration:\n"
@@ -1,6 +1,22 @@
+import os
 from pathlib import Path
 
 # Base project directory (this file is in app/utils)
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 ASSETS_DIR = PROJECT_ROOT / "assets"
 ASSETS_DIR.mkdir(exist_ok=True)
+
+# On-disk cache for torch.compile (TorchInductor) artifacts, so compiled graphs
+# survive across launches. Must be set before torch compiles anything.
+COMPILE_CACHE_DIR = ASSETS_DIR / "torch_compile"
+os.environ.setdefault("TORCHINDUCTOR_CACHE_DIR", str(COMPILE_CACHE_DIR))
+
+# Local Hugging Face cache for hub downloads, reused across launches.
+# HF_HUB_CACHE must be set before transformers/huggingface_hub are imported.
+HF_CACHE = ASSETS_DIR / "hf_cache"
+HF_CACHE.mkdir(exist_ok=True)
+os.environ.setdefault("HF_HUB_CACHE", str(HF_CACHE))
+
+# Exported ONNX graphs for the onnxruntime text backend (exported once, then reused)
+ONNX_DIR = ASSETS_DIR / "onnx"
+ONNX_DIR.mkdir(exist_ok=True)
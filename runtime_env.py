@@ -0,0 +1,33 @@
+import logging
+import os
+
+# Process-wide native-library settings. OpenMP/MKL read their env vars once, at the first
+# native import (numpy, cv2, torch), so this module must be imported before any of them;
+# explicit user settings win.
+
+
+def _default_intra_op_threads() -> int:
+    """Intra-op threads = physical cores (approximated as half the logical count):
+    hyperthreads share the core's SIMD units, so oversubscribing them slows GEMM-heavy
+    inference. A valid OMP_NUM_THREADS (a positive integer) takes precedence."""
+    try:
+        # Plain positive integer only; nested forms like "4,2", "" or "0" use the default
+        threads = int(os.environ.get("OMP_NUM_THREADS", ""))
+    except ValueError:
+        threads = 0
+    if threads < 1:
+        threads = max(1, (os.cpu_count() or 2) // 2)
+    return threads
+
+
+INTRA_OP_THREADS = _default_intra_op_threads()
+os.environ.setdefault("OMP_NUM_THREADS", str(INTRA_OP_THREADS))
+os.environ.setdefault("MKL_NUM_THREADS", str(INTRA_OP_THREADS))
+
+
+def log_level_from_env(default: int = logging.WARNING) -> int:
+    """Log level named by HF_GUI_LOG_LEVEL (e.g. "INFO"); unknown names fall back to `default`."""
+    name = os.environ.get("HF_GUI_LOG_LEVEL", "").strip().upper()
+    level = logging.getLevelName(name) if name else default
+    # getLevelName returns the string "Level <name>" for unknown names
+    return level if isinstance(level, int) else default
@@ -0,0 +1,6 @@
+import sys
+from pathlib import Path
+
+# The app modules use package-relative imports; the dependency-free ones
+# (e.g. cache.py) are imported directly from the project root in tests.
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
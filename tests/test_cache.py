@@ -0,0 +1,130 @@
+import threading
+
+import pytest
+
+from cache import LRUCache, file_content_key, text_batch_key
+
+
+def test_get_missing_returns_default():
+    cache = LRUCache(2)
+    assert cache.get("a") is None
+    assert cache.get("a", 42) == 42
+
+
+def test_put_and_get():
+    cache = LRUCache(2)
+    cache.put("a", {"results": [1]})
+    assert cache.get("a") == {"results": [1]}
+    assert "a" in cache
+    assert len(cache) == 1
+
+
+def test_evicts_least_recently_used():
+    cache = LRUCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.put("c", 3)
+    assert "a" not in cache
+    assert cache.get("b") == 2
+    assert cache.get("c") == 3
+
+
+def test_get_refreshes_recency():
+    cache = LRUCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")          # "b" is now the least recently used
+    cache.put("c", 3)
+    assert "a" in cache
+    assert "b" not in cache
+
+
+def test_put_existing_key_refreshes_recency_and_value():
+    cache = LRUCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.put("a", 10)
+    cache.put("c", 3)
+    assert cache.get("a") == 10
+    assert "b" not in cache
+    assert len(cache) == 2
+
+
+def test_tuple_keys():
+    cache = LRUCache(4)
+    cache.put(("hash", 1), "top1")
+    cache.put(("hash", 5), "top5")
+    assert cache.get(("hash", 1)) == "top1"
+    assert cache.get(("hash", 5)) == "top5"
+
+
+def test_clear():
+    cache = LRUCache(2)
+    cache.put("a", 1)
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.get("a") is None
+
+
+def test_invalid_maxsize():
+    with pytest.raises(ValueError):
+        LRUCache(0)
+
+
+def test_concurrent_get_and_clear_do_not_raise():
+    cache = LRUCache(8)
+    errors = []
+    stop = threading.Event()
+
+    def reader():
+        try:
+            while not stop.is_set():
+                cache.put("k", 1)
+                cache.get("k")
+        except Exception as e:  # pragma: no cover - only on regression
+            errors.append(e)
+
+    threads = [threading.Thread(target=reader) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for _ in range(2000):
+        cache.clear()
+    stop.set()
+    for t in threads:
+        t.join()
+    assert errors == []
+
+
+def test_file_content_key_depends_on_content_not_path(tmp_path):
+    a = tmp_path / "a.jpg"
+    b = tmp_path / "copy of a.jpg"
+    c = tmp_path / "c.jpg"
+    a.write_bytes(b"\xff\xd8" + b"x" * 100)
+    b.write_bytes(a.read_bytes())
+    c.write_bytes(b"\xff\xd8" + b"y" * 100)
+    assert file_content_key(str(a)) == file_content_key(str(b))
+    assert file_content_key(str(a)) != file_content_key(str(c))
+
+
+def test_file_content_key_includes_size_beyond_first_mib(tmp_path):
+    head = b"z" * (1 << 20)
+    short = tmp_path / "short.bin"
+    long = tmp_path / "long.bin"
+    short.write_bytes(head + b"1")
+    long.write_bytes(head + b"12")
+    assert file_content_key(str(short)) != file_content_key(str(long))
+
+
+def test_text_batch_key_is_deterministic():
+    assert text_batch_key(["good", "bad"]) == text_batch_key(["good", "bad"])
+    assert text_batch_key(["good", "bad"]) != text_batch_key(["bad", "good"])
+
+
+@pytest.mark.parametrize("a, b", [
+    (["a\x1fb"], ["a", "b"]),
+    ([], [""]),
+    (["", ""], [""]),
+    (["ab", "c"], ["a", "bc"]),
+])
+def test_text_batch_key_respects_batch_boundaries(a, b):
+    assert text_batch_key(a) != text_batch_key(b)
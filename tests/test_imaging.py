@@ -0,0 +1,70 @@
+import pytest
+
+Image = pytest.importorskip("PIL.Image")
+
+import imaging
+from imaging import decode_image
+
+
+def _save_jpeg(path, size=(40, 20), orientation=None):
+    img = Image.new("RGB", size, (200, 30, 30))
+    # Mark the top-left corner so transposes are observable
+    img.paste((0, 0, 255), (0, 0, 10, 10))
+    exif = Image.Exif()
+    if orientation is not None:
+        exif[0x0112] = orientation
+    img.save(path, "JPEG", quality=95, exif=exif.tobytes())
+    return str(path)
+
+
+def test_decode_image_returns_rgb(tmp_path):
+    path = tmp_path / "plain.png"
+    Image.new("L", (8, 6)).save(path)
+    img = decode_image(str(path))
+    assert img.mode == "RGB"
+    assert img.size == (8, 6)
+
+
+@pytest.mark.parametrize("orientation, size", [(1, (40, 20)), (3, (40, 20)), (6, (20, 40)), (8, (20, 40))])
+def test_decode_image_applies_exif_orientation(tmp_path, orientation, size):
+    path = _save_jpeg(tmp_path / "oriented.jpg", orientation=orientation)
+    assert decode_image(path).size == size
+
+
+def test_decode_image_pil_fallback_matches_exif_transpose(tmp_path, monkeypatch):
+    from PIL import ImageOps
+
+    path = _save_jpeg(tmp_path / "rot.jpg", orientation=6)
+    monkeypatch.setattr(imaging, "cv2", None)
+    with Image.open(path) as src:
+        expected = ImageOps.exif_transpose(src).convert("RGB")
+    assert decode_image(path).tobytes() == expected.tobytes()
+
+
+@pytest.fixture(params=["cv2", "pil"])
+def backend(request, monkeypatch):
+    if request.param == "cv2":
+        pytest.importorskip("cv2")
+    else:
+        monkeypatch.setattr(imaging, "cv2", None)
+    return request.param
+
+
+def test_decode_image_reduces_large_jpeg_but_covers_min_size(tmp_path, backend):
+    path = _save_jpeg(tmp_path / "big.jpg", size=(2000, 1200))
+    img = decode_image(path, min_size=(520, 300))
+    assert img.width >= 520 and img.height >= 300
+    assert img.size == (1000, 600)  # 1/2 scale; 1/4 would be 500 px wide
+
+
+def test_decode_image_min_size_is_upright(tmp_path, backend):
+    # Stored 2000x1200, displayed 1200x2000: a 520x900 upright target allows 1/2 scale
+    # (600x1000); without swapping it for the stored axes, it would force full size.
+    path = _save_jpeg(tmp_path / "rot.jpg", size=(2000, 1200), orientation=6)
+    img = decode_image(path, min_size=(520, 900))
+    assert img.size == (600, 1000)
+
+
+def test_decode_image_without_min_size_is_full_resolution(tmp_path, backend):
+    path = _save_jpeg(tmp_path / "full.jpg", size=(2000, 1200))
+    assert decode_image(path).size == (2000, 1200)
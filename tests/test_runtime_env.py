@@ -0,0 +1,53 @@
+import logging
+
+import pytest
+
+import runtime_env
+
+
+@pytest.fixture
+def eight_cpus(monkeypatch):
+    monkeypatch.setattr(runtime_env.os, "cpu_count", lambda: 8)
+
+
+@pytest.mark.parametrize("value", ["4,2", "", "0", "-3", "auto"])
+def test_invalid_omp_num_threads_uses_default(monkeypatch, eight_cpus, value):
+    monkeypatch.setenv("OMP_NUM_THREADS", value)
+    assert runtime_env._default_intra_op_threads() == 4
+
+
+def test_unset_omp_num_threads_uses_default(monkeypatch, eight_cpus):
+    monkeypatch.delenv("OMP_NUM_THREADS", raising=False)
+    assert runtime_env._default_intra_op_threads() == 4
+
+
+def test_valid_omp_num_threads_wins(monkeypatch, eight_cpus):
+    monkeypatch.setenv("OMP_NUM_THREADS", "3")
+    assert runtime_env._default_intra_op_threads() == 3
+
+
+def test_default_is_at_least_one(monkeypatch):
+    monkeypatch.delenv("OMP_NUM_THREADS", raising=False)
+    monkeypatch.setattr(runtime_env.os, "cpu_count", lambda: None)
+    assert runtime_env._default_intra_op_threads() == 1
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("INFO", logging.INFO),
+    ("debug", logging.DEBUG),
+    (" warning ", logging.WARNING),
+])
+def test_log_level_from_env_known_names(monkeypatch, value, expected):
+    monkeypatch.setenv("HF_GUI_LOG_LEVEL", value)
+    assert runtime_env.log_level_from_env() == expected
+
+
+@pytest.mark.parametrize("value", ["verbose", "", "42"])
+def test_log_level_from_env_unknown_falls_back(monkeypatch, value):
+    monkeypatch.setenv("HF_GUI_LOG_LEVEL", value)
+    assert runtime_env.log_level_from_env() == logging.WARNING
+
+
+def test_log_level_from_env_unset(monkeypatch):
+    monkeypatch.delenv("HF_GUI_LOG_LEVEL", raising=False)
+    assert runtime_env.log_level_from_env(logging.ERROR) == logging.ERROR